@@ -3,7 +3,7 @@ from dataclasses import asdict
 from urllib.parse import quote_plus, urlparse, parse_qs
 from playwright_stealth import stealth_async
 from playwright.async_api import async_playwright
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import os
 from httpx import Response
 import httpx
@@ -12,7 +12,8 @@ from src.utils import get_rating_enum
 from src.logger import logger
 from src.http_requests import AsyncRequest
 from src.http_response import ResponseWrapper
-from src.models import MapSelectors
+from src.models import MapSelectors, Place, PlaceDiff
+from src.snapshot import Snapshot
 
 
 class GmapSpider():
@@ -23,6 +24,7 @@ class GmapSpider():
     MAP_URL = "https://www.google.com/maps/search/{}"
     ZYTE_API_KEY = os.getenv("ZYTE_API_KEY")
     PLAYWRIGHT_TIMEOUT = 120*1000
+    UNCHANGED_PAGES = 2
 
 
     def __init__(self) -> None:
@@ -128,4 +130,70 @@ class GmapSpider():
         return [asdict(place) for place in places] if places else []
 
 
+    async def crawl_incremental(self, query: str, max_results: int = 20, min_rating: float = 0) -> Dict:
+        """
+        Re-crawl a query against its stored snapshot and return only the inserted, updated and deleted places.
+        Pages are fetched one at a time and pagination stops once UNCHANGED_PAGES consecutive pages come back
+        unchanged, so changes further down the results are missed while the pages before them stay stable.
+        Deletes are only reported when pagination reached the end of the results.
+        """
+        self.captured_xhr = []
+        self.places_count = 0
+
+        snapshot = Snapshot(query, min_rating)
+        snapshot.load()
+
+        response, next_xhr_url = await self.search(query, min_rating)
+        places = self._parse_places(response)
+        if not places:
+            logger.error(f"No places found for: {query}, keeping the stored snapshot")
+            return asdict(PlaceDiff())
+
+        unchanged = 1 if snapshot.is_unchanged(places, 0) else 0
+        diff = snapshot.compare(places, 0)
+        scanned = len(places)
+        exhausted = not next_xhr_url and scanned < 20
+        self.places_count += 20
 
+        while next_xhr_url and unchanged < self.UNCHANGED_PAGES and self.places_count < max_results:
+            self.places_count += 20
+            logger.info(f"Total places: {self.places_count}, Page: {round(self.places_count / 20)}")
+            try:
+                page = self._parse_places(await self._create_task(next_xhr_url))
+            except Exception as e:
+                logger.error(e)
+                page = None
+
+            if page is None:
+                break
+            if not page:
+                exhausted = True
+                break
+
+            unchanged = unchanged + 1 if snapshot.is_unchanged(page, scanned) else 0
+            page_diff = snapshot.compare(page, scanned)
+            scanned += len(page)
+            diff.inserts.extend(page_diff.inserts)
+            diff.updates.extend(page_diff.updates)
+
+        if unchanged >= self.UNCHANGED_PAGES:
+            logger.info(f"Stopped after {scanned} places, pages unchanged since last crawl")
+
+        diff.deletes = snapshot.finalize(exhausted)
+        snapshot.save()
+        logger.info(f"Inserts: {len(diff.inserts)}, Updates: {len(diff.updates)}, Deletes: {len(diff.deletes)}")
+        return asdict(diff)
+
+
+    @staticmethod
+    def _parse_places(response: ResponseWrapper) -> Optional[List[Place]]:
+        """
+        Parse the places of a response, returning None when the response is missing or unreadable.
+        """
+        if not isinstance(response, ResponseWrapper):
+            return None
+        try:
+            return response.places()
+        except Exception as e:
+            logger.error(f"Unable to parse places from {response.url}: {e}")
+            return None
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -23,6 +23,13 @@ class Place:
     hours: list = None
 
 
+@dataclass
+class PlaceDiff:
+    inserts: list = field(default_factory=list)
+    updates: list = field(default_factory=list)
+    deletes: list = field(default_factory=list)
+
+
 # this represent page button index
 class Rating(Enum):
     TWO = 1 
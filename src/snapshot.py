@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict
+from typing import Dict, List
+
+from src.logger import logger
+from src.models import Place, PlaceDiff
+from src.utils import place_hash
+
+
+class Snapshot:
+    """
+    Stores the places seen by a previous crawl of a query, keyed by place id.
+
+    Args:
+        query (str): The search query the snapshot belongs to.
+        min_rating (float, optional): The rating filter the query was crawled with. Defaults to 0.
+        directory (str, optional): Where snapshot files are kept. Defaults to "output/snapshots".
+
+    Methods:
+        load: Reads the stored snapshot from disk, if any.
+        compare: Diffs a page of places against the stored snapshot.
+        is_unchanged: Checks whether a page holds exactly the stored places for its rank range.
+        finalize: Returns the ids of stored places that disappeared from the results.
+        save: Writes the refreshed snapshot to disk.
+    """
+
+    DIRECTORY = "output/snapshots"
+
+
+    def __init__(self, query: str, min_rating: float = 0, directory: str = None) -> None:
+        self.query = query
+        self.min_rating = float(min_rating or 0)
+        self.directory = directory or self.DIRECTORY
+        slug = re.sub(r"[^a-z0-9]+", "_", query.lower()).strip("_")
+        digest = hashlib.sha1(f"{query}|{self.min_rating}".encode()).hexdigest()[:12]
+        self.path = os.path.join(self.directory, f"{slug}_{digest}.json" if slug else f"{digest}.json")
+        self.stored: Dict[str, Dict] = {}
+        self.current: Dict[str, Dict] = {}
+
+
+    def __repr__(self):
+        return f"Snapshot(query={self.query}, min_rating={self.min_rating}, path={self.path})"
+
+
+    def load(self) -> None:
+        """
+        Reads the stored snapshot from disk, if any.
+        """
+        if not os.path.exists(self.path):
+            logger.info(f"No snapshot found for: {self.query}")
+            return
+
+        try:
+            with open(self.path) as f:
+                self.stored = json.load(f).get("places", {})
+        except (OSError, ValueError) as e:
+            logger.error(f"Unable to read snapshot {self.path}: {e}")
+            self.stored = {}
+
+
+    def compare(self, places: List[Place], offset: int) -> PlaceDiff:
+        """
+        Diffs a page of places against the stored snapshot, starting at the given rank.
+        """
+        diff = PlaceDiff()
+        for rank, place in enumerate(places, start=offset):
+            if not place.id or place.id in self.current:
+                continue
+
+            digest = place_hash(place)
+            self.current[place.id] = {"hash": digest, "rank": rank}
+
+            previous = self.stored.get(place.id)
+            if previous is None:
+                diff.inserts.append(asdict(place))
+            elif previous["hash"] != digest:
+                diff.updates.append(asdict(place))
+
+        return diff
+
+
+    def is_unchanged(self, places: List[Place], offset: int) -> bool:
+        """
+        Checks whether a page holds exactly the stored places for its rank range, with the same content.
+        """
+        if not places:
+            return False
+
+        page = {place.id: place_hash(place) for place in places if place.id}
+        stored = {
+            place_id: entry["hash"] for place_id, entry in self.stored.items()
+            if not entry.get("carried") and offset <= entry["rank"] < offset + len(places)
+        }
+        return page == stored
+
+
+    def finalize(self, exhausted: bool) -> List[str]:
+        """
+        Returns the ids of stored places that were not seen again, if the results were read to the end.
+        Otherwise the unseen places may only have moved further down, so they are carried over and flagged
+        so their old rank no longer counts towards is_unchanged.
+        """
+        deletes = []
+        for place_id, entry in self.stored.items():
+            if place_id in self.current:
+                continue
+            if exhausted:
+                deletes.append(place_id)
+            else:
+                self.current[place_id] = {**entry, "carried": True}
+
+        return deletes
+
+
+    def save(self) -> None:
+        """
+        Writes the refreshed snapshot to disk.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({"query": self.query, "min_rating": self.min_rating, "places": self.current}, f, ensure_ascii=False)
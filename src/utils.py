@@ -1,5 +1,8 @@
+import hashlib
+import json
+from dataclasses import asdict
 from typing import Optional
-from src.models import Rating
+from src.models import Place, Rating
 
 
 
@@ -35,4 +38,22 @@ def safe_get(place: dict, *args) -> Optional[str]:
         except (IndexError, TypeError, KeyError):
             return None
     
-    return place
\ No newline at end of file
+    return place
+
+
+# fields that make up the content hash of a place, leaving out `status` (open/closes-at text)
+# and `reviews` (review count) which change between every crawl
+HASH_FIELDS = (
+    'id', 'title', 'website', 'owner', 'main_category', 'categories', 'rating',
+    'phone', 'address', 'detailed_address', 'timezone', 'coordinates', 'hours',
+)
+
+
+def place_hash(place: Place) -> str:
+    """
+    Returns a stable content hash of the HASH_FIELDS of a place.
+    """
+
+    fields = asdict(place)
+    payload = json.dumps({key: fields[key] for key in HASH_FIELDS}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
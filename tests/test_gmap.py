@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.gmap import GmapSpider
+from src.http_response import ResponseWrapper
+from src.models import Place
+from src.snapshot import Snapshot
+
+XHR_URL = "https://www.google.com/search?tbm=map&pb=!8i20&ech=1"
+
+
+def make_places(ids):
+    return [Place(id=str(i), title=f"place {i}") for i in ids]
+
+
+def make_response(places):
+    response = MagicMock(spec=ResponseWrapper)
+    response.places.return_value = places
+    response.url = XHR_URL
+    return response
+
+
+@pytest.fixture(autouse=True)
+def snapshot_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(Snapshot, "DIRECTORY", str(tmp_path))
+
+
+def crawl(first_page, pages, xhr_url=XHR_URL, max_results=200):
+    """
+    Run crawl_incremental against canned pages, a page can be a list of places, None or an exception.
+    """
+    spider = GmapSpider()
+    requested = []
+
+    async def search(query, min_rating):
+        return (make_response(first_page) if first_page is not None else None), xhr_url
+
+    async def create_task(next_xhr_url):
+        page = pages[len(requested)]
+        requested.append(next_xhr_url)
+        if isinstance(page, Exception):
+            raise page
+        return make_response(page) if page is not None else None
+
+    spider.search = search
+    spider._create_task = create_task
+    diff = asyncio.run(spider.crawl_incremental("Developers in Lahore", max_results=max_results))
+    return diff, len(requested)
+
+
+def test_first_run_reads_to_the_end():
+    diff, requests = crawl(make_places(range(20)), [make_places(range(20, 40)), []])
+
+    assert len(diff["inserts"]) == 40
+    assert diff["updates"] == [] and diff["deletes"] == []
+    assert requests == 2
+
+
+def test_stops_after_unchanged_pages():
+    crawl(make_places(range(20)), [make_places(range(20, 40)), make_places(range(40, 60)), []])
+    diff, requests = crawl(make_places(range(20)), [make_places(range(20, 40)), make_places(range(40, 60))])
+
+    assert diff == {"inserts": [], "updates": [], "deletes": []}
+    assert requests == GmapSpider.UNCHANGED_PAGES - 1
+
+
+def test_full_last_page_followed_by_empty_page_reports_deletes():
+    crawl(make_places(range(20)), [make_places(range(20, 40)), []])
+    diff, _ = crawl(make_places([i for i in range(21) if i != 5]), [make_places(range(21, 40)) + [Place(id="new")], []])
+
+    assert diff["deletes"] == ["5"]
+    assert [place["id"] for place in diff["inserts"]] == ["new"]
+
+
+def test_single_short_page_without_xhr_reports_deletes():
+    crawl(make_places(range(8)), [], xhr_url=None)
+    diff, requests = crawl(make_places(range(7)), [], xhr_url=None)
+
+    assert diff["deletes"] == ["7"]
+    assert requests == 0
+
+
+@pytest.mark.parametrize("failure", [None, KeyError("ech")])
+def test_failed_page_keeps_partial_snapshot(failure):
+    crawl(make_places(range(20)), [make_places(range(20, 40)), []])
+    diff, _ = crawl(make_places([i for i in range(21) if i != 5]), [failure])
+    assert diff["deletes"] == []
+
+    diff, _ = crawl(make_places([i for i in range(21) if i != 5]), [make_places(range(21, 40)), []])
+    assert diff == {"inserts": [], "updates": [], "deletes": ["5"]}
+
+
+@pytest.mark.parametrize("first_page", [None, []])
+def test_empty_first_page_keeps_snapshot(first_page):
+    crawl(make_places(range(20)), [make_places(range(20, 40)), []])
+    path = Snapshot("Developers in Lahore").path
+    with open(path) as f:
+        saved = f.read()
+
+    diff, requests = crawl(first_page, [])
+
+    assert diff == {"inserts": [], "updates": [], "deletes": []}
+    assert requests == 0
+    with open(path) as f:
+        assert f.read() == saved
+
+
+def test_repeated_calls_reset_pagination():
+    spider = GmapSpider()
+    spider.places_count = 500
+    spider.captured_xhr = ["stale"]
+
+    async def search(query, min_rating):
+        return make_response(make_places(range(20))), XHR_URL
+
+    requested = []
+
+    async def create_task(next_xhr_url):
+        requested.append(spider.places_count)
+        return make_response([])
+
+    spider.search = search
+    spider._create_task = create_task
+    asyncio.run(spider.crawl_incremental("Developers in Lahore", max_results=200))
+
+    assert requested == [40]
+    assert spider.captured_xhr == []
@@ -0,0 +1,136 @@
+from src.models import Place
+from src.snapshot import Snapshot
+
+
+def make_places(ids, title="place"):
+    return [Place(id=str(i), title=f"{title} {i}") for i in ids]
+
+
+def stored_snapshot(tmp_path, ids, **kwargs):
+    snapshot = Snapshot("Developers in Lahore", directory=str(tmp_path), **kwargs)
+    snapshot.compare(make_places(ids), 0)
+    snapshot.finalize(exhausted=True)
+    snapshot.save()
+
+    snapshot = Snapshot("Developers in Lahore", directory=str(tmp_path), **kwargs)
+    snapshot.load()
+    return snapshot
+
+
+def test_first_run_reports_inserts(tmp_path):
+    snapshot = Snapshot("Developers in Lahore", directory=str(tmp_path))
+    snapshot.load()
+    places = make_places(range(20))
+
+    assert not snapshot.is_unchanged(places, 0)
+    diff = snapshot.compare(places, 0)
+    assert [place["id"] for place in diff.inserts] == [str(i) for i in range(20)]
+    assert diff.updates == []
+
+
+def test_insert_and_update(tmp_path):
+    snapshot = stored_snapshot(tmp_path, range(20))
+    places = make_places(range(19))
+    places[3].title = "renamed"
+    places.append(Place(id="new", title="new"))
+
+    assert not snapshot.is_unchanged(places, 0)
+    diff = snapshot.compare(places, 0)
+    assert [place["id"] for place in diff.inserts] == ["new"]
+    assert [place["id"] for place in diff.updates] == ["3"]
+
+
+def test_unchanged_page(tmp_path):
+    snapshot = stored_snapshot(tmp_path, range(40))
+    places = make_places(range(20, 40))
+
+    assert snapshot.is_unchanged(places, 20)
+    diff = snapshot.compare(places, 20)
+    assert diff.inserts == [] and diff.updates == []
+
+
+def test_rank_shift_is_not_unchanged_nor_deleted(tmp_path):
+    snapshot = stored_snapshot(tmp_path, range(40))
+    page = make_places([i for i in range(21) if i != 5])
+
+    assert not snapshot.is_unchanged(page, 0)
+    diff = snapshot.compare(page, 0)
+    assert diff.inserts == [] and diff.updates == []
+    assert snapshot.finalize(exhausted=False) == []
+    assert "5" in snapshot.current
+
+
+def test_deletes_only_when_exhausted(tmp_path):
+    snapshot = stored_snapshot(tmp_path, range(40))
+    snapshot.compare(make_places(range(20)), 0)
+    snapshot.compare(make_places(range(20, 33)), 20)
+
+    assert sorted(snapshot.finalize(exhausted=True), key=int) == [str(i) for i in range(33, 40)]
+    assert len(snapshot.current) == 33
+
+
+def test_short_final_page_without_confirmation_keeps_places(tmp_path):
+    snapshot = stored_snapshot(tmp_path, range(40))
+    snapshot.compare(make_places(range(20)), 0)
+    snapshot.compare(make_places(range(20, 25)), 20)
+
+    assert snapshot.finalize(exhausted=False) == []
+    assert len(snapshot.current) == 40
+
+
+def test_empty_page_is_not_unchanged(tmp_path):
+    snapshot = stored_snapshot(tmp_path, range(40))
+
+    assert not snapshot.is_unchanged([], 0)
+    diff = snapshot.compare([], 0)
+    assert diff.inserts == [] and diff.updates == []
+    assert snapshot.finalize(exhausted=False) == []
+
+
+def test_snapshot_path_is_unique_per_query_and_rating(tmp_path):
+    paths = {
+        Snapshot(query, min_rating, directory=str(tmp_path)).path
+        for query, min_rating in [
+            ("ڈویلپرز لاہور", 0),
+            ("ラーメン 東京", 0),
+            ("Developers in Lahore", 0),
+            ("Developers, in Lahore", 0),
+            ("Developers in Lahore", 4),
+        ]
+    }
+    assert len(paths) == 5
+
+
+def run(tmp_path, pages, exhausted):
+    snapshot = Snapshot("Developers in Lahore", directory=str(tmp_path))
+    snapshot.load()
+    unchanged, offset = [], 0
+    for page in pages:
+        unchanged.append(snapshot.is_unchanged(page, offset))
+        snapshot.compare(page, offset)
+        offset += len(page)
+    deletes = snapshot.finalize(exhausted)
+    snapshot.save()
+    return unchanged, deletes
+
+
+def test_carried_place_does_not_block_later_runs(tmp_path):
+    run(tmp_path, [make_places(range(20)), make_places(range(20, 40))], exhausted=True)
+
+    pages = [make_places([i for i in range(21) if i != 5]), make_places(range(21, 40))]
+    assert run(tmp_path, pages, exhausted=False) == ([False, False], [])
+
+    for _ in range(2):
+        assert run(tmp_path, pages, exhausted=False) == ([True, True], [])
+
+    assert run(tmp_path, pages, exhausted=True) == ([True, True], ["5"])
+
+
+def test_volatile_fields_are_not_hashed(tmp_path):
+    snapshot = stored_snapshot(tmp_path, range(20))
+    places = make_places(range(20))
+    places[0].status = "Closes 9 pm"
+    places[1].reviews = 1234
+
+    assert snapshot.is_unchanged(places, 0)
+    assert snapshot.compare(places, 0).updates == []